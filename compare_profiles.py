@@ -0,0 +1,127 @@
+"""比較兩份效能分析報告（monitor.py --profile 產生的 profiles/<時間>/ 目錄）
+
+用法：
+    python compare_profiles.py profiles/20260101-090000 profiles/20260102-090000
+    python compare_profiles.py OLD NEW --threshold 20
+
+任何指標成長超過門檻（百分比）時以結束碼 1 結束，方便在上線前發現效能退化。
+"""
+import argparse
+import json
+import pstats
+import sys
+from pathlib import Path
+
+# 要比較的整體指標：(report.json 欄位, 顯示名稱, 單位)
+METRICS = [
+    ("wall_time", "總執行時間", "s"),
+    ("python_peak_bytes", "Python 記憶體峰值", "B"),
+    ("chrome_peak_rss_bytes", "Chrome RSS 峰值", "B"),
+]
+
+
+def function_key(func, repo_root=None):
+    """產生跨機器可比較的函式名稱
+
+    專案內的檔案改用相對路徑並省略行號（程式修改後行號會變動），
+    其他函式庫維持完整路徑。
+    """
+    file_name, line, func_name = func
+    if repo_root:
+        try:
+            relative = Path(file_name).relative_to(repo_root)
+        except ValueError:
+            pass
+        else:
+            return f"{relative.as_posix()}({func_name})"
+    return f"{file_name}:{line}({func_name})"
+
+
+def load_report(report_dir):
+    """讀取報告目錄中的 report.json 與 profile.pstats"""
+    report_dir = Path(report_dir)
+    with open(report_dir / "report.json", "r", encoding="utf-8") as f:
+        report = json.load(f)
+
+    functions = {}
+    stats_file = report_dir / "profile.pstats"
+    if stats_file.exists():
+        stats = pstats.Stats(str(stats_file))
+        repo_root = report.get("repo_root")
+        for func, (cc, nc, tt, ct, _) in stats.stats.items():
+            key = function_key(func, repo_root)
+            functions[key] = functions.get(key, 0.0) + ct
+    return report, functions
+
+
+def format_value(value, unit):
+    """依單位格式化數值"""
+    if unit == "B":
+        return f"{value / 1024 / 1024:.1f} MB"
+    return f"{value:.3f} {unit}"
+
+
+def percent_change(old, new):
+    """計算成長百分比，舊值為 0 時返回 None"""
+    if not old:
+        return None
+    return (new - old) / old * 100
+
+
+def compare_reports(old_dir, new_dir, threshold, top_n):
+    """列印兩份報告的差異，返回超過門檻的指標列表"""
+    old_report, old_functions = load_report(old_dir)
+    new_report, new_functions = load_report(new_dir)
+    regressions = []
+
+    print(f"舊報告: {old_dir} ({old_report.get('started_at')})")
+    print(f"新報告: {new_dir} ({new_report.get('started_at')})")
+    print()
+
+    for key, label, unit in METRICS:
+        old = old_report.get(key, 0)
+        new = new_report.get(key, 0)
+        change = percent_change(old, new)
+        change_text = f"{change:+.1f}%" if change is not None else "n/a"
+        flag = ""
+        if change is not None and change > threshold:
+            flag = "  <-- 退化"
+            regressions.append(label)
+        print(f"{label:<16} {format_value(old, unit):>12} -> {format_value(new, unit):>12}  {change_text}{flag}")
+
+    # 各函式累計時間差異，依增加量排序
+    deltas = []
+    for name in set(old_functions) | set(new_functions):
+        old = old_functions.get(name, 0.0)
+        new = new_functions.get(name, 0.0)
+        deltas.append((new - old, old, new, name))
+    deltas.sort(reverse=True)
+
+    if deltas:
+        print()
+        print(f"累計時間增加最多的 {top_n} 個函式：")
+        for delta, old, new, name in deltas[:top_n]:
+            print(f"  {delta:+9.3f}s  {old:9.3f}s -> {new:9.3f}s  {name}")
+
+    return regressions
+
+
+def main():
+    """命令列進入點"""
+    parser = argparse.ArgumentParser(description="比較兩份 monitor.py --profile 報告")
+    parser.add_argument("old", help="基準報告目錄")
+    parser.add_argument("new", help="新報告目錄")
+    parser.add_argument("--threshold", type=float, default=10.0, help="視為退化的成長百分比（預設 10）")
+    parser.add_argument("--top", type=int, default=15, help="列出累計時間增加最多的函式數量")
+    args = parser.parse_args()
+
+    regressions = compare_reports(args.old, args.new, args.threshold, args.top)
+    if regressions:
+        print()
+        print(f"發現效能退化: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
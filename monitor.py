@@ -2,6 +2,8 @@ import requests
 import json
 import os
 import re
+import sys
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -22,6 +24,35 @@ except ImportError:
 BASE_URL = "https://kinpogroupinc-my.sharepoint.com/personal/tb690310_kinpogroup_com/_layouts/15/onedrive.aspx"
 FOLDER_ID = "%2Fpersonal%2Ftb690310%5Fkinpogroup%5Fcom%2FDocuments%2FKINPO%20GROUP%20Scope%203"
 
+# 各階段的執行時間上限（秒），超過就強制結束 Chrome
+STAGE_TIMEOUTS = {
+    "create_driver": 120,
+    "login": 90,
+    "activity": 180,
+}
+# Selenium 本身的頁面載入 / JS 執行逾時（秒）
+PAGE_LOAD_TIMEOUT = 60
+SCRIPT_TIMEOUT = 30
+# Teams webhook 的連線 / 讀取逾時（秒）
+WEBHOOK_TIMEOUT = 30
+# 逾時後最多重新啟動 Chrome 幾次
+MAX_DRIVER_RESTARTS = 1
+
+# 防止重複執行的鎖定檔，以及最後一次執行結果
+LOCK_FILE = SCRIPT_DIR / "monitor.lock"
+RUN_STATUS_FILE = SCRIPT_DIR / "run_status.json"
+
+# 常駐模式：查詢 API 位址與檢查間隔（秒）
+FOLDER_DATA_FILE = SCRIPT_DIR / "folder_data.json"
+API_HOST = os.environ.get("MONITOR_API_HOST", "127.0.0.1")
+API_PORT = int(os.environ.get("MONITOR_API_PORT", "8765"))
+CHECK_INTERVAL = 3600
+
+# 效能分析報告目錄、列出前幾名、Chrome 記憶體取樣間隔（秒）
+PROFILE_DIR = SCRIPT_DIR / "profiles"
+PROFILE_TOP_N = 20
+RSS_SAMPLE_INTERVAL = 0.5
+
 
 def create_driver():
     """建立 Selenium driver"""
@@ -38,7 +69,124 @@ def create_driver():
     chrome_options.add_argument("--window-size=1920,1080")
 
     service = Service(ChromeDriverManager().install())
-    return webdriver.Chrome(service=service, options=chrome_options)
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    driver.set_script_timeout(SCRIPT_TIMEOUT)
+    return driver
+
+
+class StageTimeout(Exception):
+    """某個階段超過時間上限"""
+
+    def __init__(self, stage, timeout):
+        super().__init__(f"階段 {stage} 超過 {timeout} 秒未完成")
+        self.stage = stage
+        self.timeout = timeout
+
+
+def kill_chrome_tree():
+    """強制結束本程序底下的 chromedriver / Chrome 程序樹"""
+    import psutil
+
+    children = psutil.Process().children(recursive=True)
+    for child in children:
+        try:
+            child.kill()
+        except psutil.NoSuchProcess:
+            pass
+    psutil.wait_procs(children, timeout=5)
+    print(f"已強制結束 {len(children)} 個 Chrome 相關程序")
+
+
+# 效能分析時各階段工作執行緒的 cProfile，由 run_with_profiler 設定並合併
+_stage_profilers = None
+
+
+def run_stage(stage, func, *args, timeout=None):
+    """在工作執行緒中執行單一階段，超過時間上限立即丟出 StageTimeout
+
+    driver.get、page_source、execute_script、ChromeDriverManager 下載都可能卡住不回應，
+    主執行緒只等待到時間上限：逾時就砍掉 Chrome 程序樹並丟出 StageTimeout，
+    不依賴卡住的呼叫自行返回。卡住的工作執行緒是 daemon，不會阻止程式結束。
+    """
+    timeout = timeout or STAGE_TIMEOUTS[stage]
+    outcome = {}
+    abandoned = threading.Event()
+    profilers = _stage_profilers
+
+    def target():
+        profiler = None
+        if profilers is not None:
+            import cProfile
+
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            outcome["value"] = func(*args)
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profilers.append(profiler)
+        # 逾時後才建好的 driver 已無人使用，直接關閉
+        if abandoned.is_set() and hasattr(outcome.get("value"), "quit"):
+            try:
+                outcome["value"].quit()
+            except Exception:
+                pass
+
+    worker = threading.Thread(target=target, name=f"stage-{stage}", daemon=True)
+    worker.start()
+    worker.join(timeout)
+
+    if worker.is_alive():
+        abandoned.set()
+        print(f"階段 {stage} 超過 {timeout} 秒，強制結束 Chrome")
+        kill_chrome_tree()
+        raise StageTimeout(stage, timeout)
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["value"]
+
+
+def acquire_run_lock():
+    """取得執行鎖，已有其他程序在執行時返回 None"""
+    import fcntl
+
+    # 用 a+ 開啟，取得鎖之前不清空檔案，保留目前持有者的 PID
+    lock_fd = open(LOCK_FILE, "a+")
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_fd.close()
+        return None
+    lock_fd.seek(0)
+    lock_fd.truncate()
+    lock_fd.write(str(os.getpid()))
+    lock_fd.flush()
+    return lock_fd
+
+
+def release_run_lock(lock_fd):
+    """釋放執行鎖"""
+    import fcntl
+
+    fcntl.flock(lock_fd, fcntl.LOCK_UN)
+    lock_fd.close()
+
+
+def record_run_status(status, stage=None, reason=None, restarts=0):
+    """記錄最後一次執行的結果與失敗原因"""
+    data = {
+        "finished_at": datetime.now().isoformat(),
+        "status": status,
+        "stage": stage,
+        "reason": reason,
+        "restarts": restarts,
+    }
+    with open(RUN_STATUS_FILE, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
 
 
 def login_microsoft(driver):
@@ -463,14 +611,18 @@ def get_activity_from_panel(driver):
     return activities
 
 
-def load_previous_data():
-    """載入上次的資料"""
+def load_json_file(path, default):
+    """讀取 JSON 檔案，不存在或格式錯誤時返回預設值"""
     try:
-        data_file = SCRIPT_DIR / "activity_data.json"
-        with open(data_file, "r", encoding="utf-8") as f:
+        with open(path, "r", encoding="utf-8") as f:
             return json.load(f)
-    except:
-        return {"last_check": None, "activities": []}
+    except (OSError, ValueError):
+        return default
+
+
+def load_previous_data():
+    """載入上次的資料"""
+    return load_json_file(SCRIPT_DIR / "activity_data.json", {"last_check": None, "activities": []})
 
 
 def save_current_data(data):
@@ -480,6 +632,31 @@ def save_current_data(data):
         json.dump(data, f, ensure_ascii=False, indent=2)
 
 
+def update_folder_data(activities):
+    """依新活動更新 folder_data.json 中各資料夾的檔案狀態"""
+    folder_data = load_json_file(FOLDER_DATA_FILE, {})
+
+    # 面板上最新的活動在前，反向套用讓最新的結果留下
+    for act in reversed(activities):
+        folder = act.get("folder")
+        file_name = act.get("file_name")
+        act_time = act.get("time")
+        if not folder or not file_name or not act_time:
+            continue
+
+        files = folder_data.setdefault(folder, {})
+        if act.get("action") == "刪除":
+            files.pop(file_name, None)
+        else:
+            files[file_name] = {
+                "date": act_time.strftime("%Y/%m/%d"),
+                "by": act.get("modifier", ""),
+            }
+
+    with open(FOLDER_DATA_FILE, "w", encoding="utf-8") as f:
+        json.dump(folder_data, f, ensure_ascii=False, indent=2)
+
+
 def send_teams_message(message):
     """發送 Teams 訊息"""
     if not TEAMS_WEBHOOK_URL:
@@ -508,7 +685,7 @@ def send_teams_message(message):
     }
 
     try:
-        response = requests.post(TEAMS_WEBHOOK_URL, json=payload)
+        response = requests.post(TEAMS_WEBHOOK_URL, json=payload, timeout=WEBHOOK_TIMEOUT)
         if response.status_code == 200 or response.status_code == 202:
             print("Teams 訊息發送成功")
         else:
@@ -572,7 +749,7 @@ def send_teams_message_with_mention(message, exclude_names=None):
     }
 
     try:
-        response = requests.post(TEAMS_WEBHOOK_URL, json=payload)
+        response = requests.post(TEAMS_WEBHOOK_URL, json=payload, timeout=WEBHOOK_TIMEOUT)
         if response.status_code == 200 or response.status_code == 202:
             mentioned_names = ", ".join([p['name'] for p in people]) if people else "無"
             print(f"Teams 訊息發送成功（已 @ {mentioned_names}）")
@@ -582,32 +759,217 @@ def send_teams_message_with_mention(message, exclude_names=None):
         print(f"發送 Teams 訊息時發生錯誤: {e}")
 
 
-def check_for_updates():
-    """檢查是否有更新"""
-    print(f"開始檢查... {datetime.now()}")
+def fetch_activities():
+    """登入並讀取活動紀錄，階段逾時時重新啟動 Chrome 再試一次
+
+    返回 (活動列表, 重新啟動次數)
+    """
+    restarts = 0
+    while True:
+        driver = None
+        try:
+            driver = run_stage("create_driver", create_driver)
+
+            print("登入中...")
+            run_stage("login", login_microsoft, driver)
+
+            print("讀取活動紀錄...")
+            activities = run_stage("activity", get_activity_from_panel, driver)
+            print(f"取得 {len(activities)} 個活動")
+
+            # 印出活動內容以便除錯
+            for act in activities:
+                print(f"  - {act.get('modifier', '?')} {act.get('action', '?')}: {act.get('file_name', '?')} ({act.get('time_str', '?')})")
+
+            return activities, restarts
+        except StageTimeout:
+            if restarts >= MAX_DRIVER_RESTARTS:
+                raise
+            restarts += 1
+            print(f"重新啟動 Chrome（第 {restarts} 次）...")
+        finally:
+            if driver is not None:
+                try:
+                    driver.quit()
+                except Exception:
+                    kill_chrome_tree()
+
+
+class ChromeMemorySampler:
+    """在背景定期取樣 chromedriver / Chrome 程序樹的 RSS，記錄峰值"""
+
+    def __init__(self, interval=RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak_rss = 0
+        self.peak_processes = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        import psutil
+
+        total = 0
+        children = psutil.Process().children(recursive=True)
+        for child in children:
+            try:
+                total += child.memory_info().rss
+            except psutil.NoSuchProcess:
+                pass
+        if total > self.peak_rss:
+            self.peak_rss = total
+            self.peak_processes = len(children)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        return False
+
 
-    driver = create_driver()
+def function_key(func, repo_root):
+    """cProfile 函式名稱：專案內檔案用相對路徑且省略行號，其他維持完整路徑
 
+    與 compare_profiles.py 使用相同規則，報告才能跨機器比較。
+    """
+    file_name, line, func_name = func
     try:
-        print("登入中...")
-        login_microsoft(driver)
+        relative = Path(file_name).relative_to(repo_root)
+    except ValueError:
+        return f"{file_name}:{line}({func_name})"
+    return f"{relative.as_posix()}({func_name})"
+
+
+def write_profile_report(report_dir, started_at, result, wall_time, profiler, stage_profilers, sampler, before, after, current, peak):
+    """寫出 cProfile、tracemalloc 與 report.json"""
+    import io
+    import pstats
+
+    # cProfile：合併主執行緒與各階段工作執行緒，輸出原始 stats 檔與依累計時間排序的文字報告
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, *stage_profilers, stream=stream)
+    stats.dump_stats(str(report_dir / "profile.pstats"))
+    stats.sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+    (report_dir / "profile.txt").write_text(stream.getvalue(), encoding="utf-8")
+
+    # tracemalloc：執行前後的記憶體差異
+    diff = after.compare_to(before, "lineno")[:PROFILE_TOP_N]
+    (report_dir / "tracemalloc_diff.txt").write_text(
+        "\n".join(str(stat) for stat in diff) + "\n", encoding="utf-8"
+    )
+
+    top_functions = []
+    for func, (cc, nc, tt, ct, _) in sorted(
+        stats.stats.items(), key=lambda item: item[1][3], reverse=True
+    )[:PROFILE_TOP_N]:
+        top_functions.append({
+            "function": function_key(func, SCRIPT_DIR),
+            "ncalls": nc,
+            "tottime": round(tt, 6),
+            "cumtime": round(ct, 6),
+        })
+
+    report = {
+        "started_at": started_at.isoformat(),
+        "repo_root": str(SCRIPT_DIR),
+        "result": result,
+        "wall_time": round(wall_time, 3),
+        "python_current_bytes": current,
+        "python_peak_bytes": peak,
+        "chrome_peak_rss_bytes": sampler.peak_rss,
+        "chrome_peak_processes": sampler.peak_processes,
+        "top_functions": top_functions,
+        "top_allocations": [
+            {"location": str(stat.traceback), "size_diff": stat.size_diff, "count_diff": stat.count_diff}
+            for stat in diff
+        ],
+    }
+    with open(report_dir / "report.json", "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"效能分析報告已儲存到 {report_dir}")
+
+
+def run_with_profiler(func):
+    """以 cProfile、tracemalloc 與 Chrome RSS 取樣執行 func，報告寫到 profiles/<時間>/
+
+    func 丟出例外時仍會寫出報告（result 記為 "error: ..."），再將例外往上丟。
+    """
+    global _stage_profilers
+    import cProfile
+    import time
+    import tracemalloc
+
+    started_at = datetime.now()
+    # 目錄名稱含微秒，且不重用既有目錄，避免同一秒內的兩次執行互相覆蓋
+    report_dir = PROFILE_DIR / started_at.strftime("%Y%m%d-%H%M%S-%f")
+    report_dir.mkdir(parents=True)
+
+    profiler = cProfile.Profile()
+    stage_profilers = _stage_profilers = []
+    sampler = ChromeMemorySampler()
+    # 已用 -X tracemalloc 啟動時沿用，不在結束時關掉
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    result = None
+
+    try:
+        with sampler:
+            profiler.enable()
+            try:
+                result = func()
+            finally:
+                profiler.disable()
+    except Exception as e:
+        result = f"error: {type(e).__name__}: {e}"
+        raise
+    finally:
+        wall_time = time.perf_counter() - start
+        _stage_profilers = None
+        after = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if started_tracing:
+            tracemalloc.stop()
+        # 報告寫入失敗只記錄，不可蓋掉 func 本身的例外
+        try:
+            write_profile_report(report_dir, started_at, result, wall_time, profiler, stage_profilers, sampler, before, after, current, peak)
+        except Exception as e:
+            print(f"效能分析報告寫入失敗: {e}")
+            import traceback
+            traceback.print_exc()
+
+    return result
 
-        print("讀取活動紀錄...")
-        activities = get_activity_from_panel(driver)
-        print(f"取得 {len(activities)} 個活動")
 
-        # 印出活動內容以便除錯
-        for act in activities:
-            print(f"  - {act.get('modifier', '?')} {act.get('action', '?')}: {act.get('file_name', '?')} ({act.get('time_str', '?')})")
+def check_for_updates(profile=False):
+    """檢查是否有更新，profile=True 時另外產生效能分析報告"""
+    if profile:
+        return run_with_profiler(check_for_updates)
+
+    print(f"開始檢查... {datetime.now()}")
 
+    try:
+        activities, restarts = fetch_activities()
+    except StageTimeout as e:
+        print(f"Error: {e}")
+        record_run_status("failed", stage=e.stage, reason=str(e), restarts=MAX_DRIVER_RESTARTS)
+        return False
     except Exception as e:
         print(f"Error: {e}")
         import traceback
         traceback.print_exc()
-        driver.quit()
-        return
-    finally:
-        driver.quit()
+        record_run_status("failed", reason=f"{type(e).__name__}: {e}")
+        return False
 
     # 載入上次資料
     previous_data = load_previous_data()
@@ -703,8 +1065,268 @@ def check_for_updates():
         ]
     }
     save_current_data(current_data)
+    update_folder_data(new_activities)
+    record_run_status("ok", restarts=restarts)
     print("完成檢查")
+    return True
+
+
+def run_locked_check(profile=False):
+    """取得執行鎖後檢查更新，避免與上一次排程重疊"""
+    lock_fd = acquire_run_lock()
+    if lock_fd is None:
+        print("上一次檢查仍在執行中，略過本次檢查")
+        return 1
+
+    try:
+        return 0 if check_for_updates(profile=profile) else 1
+    except Exception as e:
+        # 抓取之後（儲存資料、發送通知等）的錯誤也要記錄，/status 才不會停留在上次的 ok
+        print(f"Error: {e}")
+        import traceback
+        traceback.print_exc()
+        record_run_status("failed", reason=f"{type(e).__name__}: {e}")
+        return 1
+    finally:
+        release_run_lock(lock_fd)
+
+
+# 查詢 API 的回應快取：正規化後的路由 -> (狀態碼, JSON bytes)
+# 每次檢查完成後清空；其他程序（例如 cron）改寫狀態檔時也會依修改時間清空
+_api_cache = {}
+_api_cache_mtimes = None
+# /activities/recent 的 limit 上限，同時限制快取項目數量
+MAX_RECENT_LIMIT = 100
+# 讀取 HTTP 請求標頭的時間上限（秒），避免閒置連線一直佔用
+API_READ_TIMEOUT = 10
+
+
+def invalidate_api_cache():
+    """清空查詢 API 快取"""
+    global _api_cache_mtimes
+    _api_cache.clear()
+    _api_cache_mtimes = None
+
+
+def state_file_mtimes():
+    """API 讀取的各狀態檔修改時間與大小，檔案不存在時為 None"""
+    mtimes = []
+    for path in (SCRIPT_DIR / "activity_data.json", FOLDER_DATA_FILE, RUN_STATUS_FILE):
+        try:
+            stat = path.stat()
+            mtimes.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+def api_recent_activities(limit=20):
+    """最近的活動紀錄（依面板順序，最新在前）"""
+    data = load_previous_data()
+    activities = data.get("activities", [])
+    return {
+        "last_check": data.get("last_check"),
+        "count": len(activities),
+        "activities": activities[:limit],
+    }
+
+
+def api_folder_status(folder=None):
+    """各資料夾的檔案數、最後更新日期與更新者"""
+    folder_data = load_json_file(FOLDER_DATA_FILE, {})
+    activities = load_previous_data().get("activities", [])
+
+    folders = {}
+    for name, files in folder_data.items():
+        latest_name, latest = max(files.items(), key=lambda item: item[1].get("date", ""), default=(None, {}))
+        folders[name] = {
+            "file_count": len(files),
+            "last_updated": latest.get("date"),
+            "last_updated_by": latest.get("by"),
+            "last_updated_file": latest_name,
+            "recent_activity_count": sum(1 for act in activities if act.get("folder") == name),
+        }
+
+    if folder is None:
+        return {"folders": folders}
+    return folders.get(folder)
+
+
+def api_modifier_counts():
+    """各修改者在最近活動中的次數（依動作分類）"""
+    counts = {}
+    for act in load_previous_data().get("activities", []):
+        modifier = act.get("modifier") or "未知"
+        action = act.get("action") or "未知"
+        per_modifier = counts.setdefault(modifier, {"total": 0})
+        per_modifier["total"] += 1
+        per_modifier[action] = per_modifier.get(action, 0) + 1
+    return {"modifiers": counts}
+
+
+def resolve_api_route(path):
+    """將請求路徑正規化成路由鍵，返回 (路由鍵, 錯誤回應)
+
+    查詢參數只保留路由用得到的部分，讓同一個資源只對應一個快取項目。
+    """
+    from urllib.parse import urlsplit, parse_qs, unquote
+
+    url = urlsplit(path)
+    parts = tuple(unquote(part) for part in url.path.split("/") if part)
+    query = parse_qs(url.query)
+
+    if parts == ("activities", "recent"):
+        try:
+            limit = int(query.get("limit", ["20"])[0])
+        except ValueError:
+            return None, (400, {"error": "limit 必須是整數"})
+        return parts + (min(max(limit, 0), MAX_RECENT_LIMIT),), None
+    if parts in (("folders",), ("modifiers",), ("status",)):
+        return parts, None
+    if len(parts) == 2 and parts[0] == "folders":
+        return parts, None
+    return None, (404, {"error": "not found"})
+
+
+def route_api_request(route):
+    """依路由鍵產生回應，返回 (狀態碼, 資料)"""
+    if route[:2] == ("activities", "recent"):
+        return 200, api_recent_activities(route[2])
+    if route == ("folders",):
+        return 200, api_folder_status()
+    if route[0] == "folders":
+        status = api_folder_status(route[1])
+        if status is None:
+            return 404, {"error": f"找不到資料夾 {route[1]}"}
+        return 200, status
+    if route == ("modifiers",):
+        return 200, api_modifier_counts()
+    return 200, load_json_file(RUN_STATUS_FILE, {})
+
+
+def encode_api_response(status, payload):
+    """將回應資料編碼成 JSON bytes"""
+    return status, json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def get_api_response(path):
+    """從快取取得回應，沒有時才讀取狀態檔"""
+    global _api_cache_mtimes
+
+    route, error = resolve_api_route(path)
+    if error is not None:
+        return encode_api_response(*error)
+
+    mtimes = state_file_mtimes()
+    if mtimes != _api_cache_mtimes:
+        _api_cache.clear()
+        _api_cache_mtimes = mtimes
+    if route in _api_cache:
+        return _api_cache[route]
+
+    response = encode_api_response(*route_api_request(route))
+    # 只快取成功的回應：路由鍵已正規化，項目數量受資料夾數與 limit 上限限制
+    if response[0] == 200:
+        _api_cache[route] = response
+    return response
+
+
+async def read_request_line(reader):
+    """讀取請求行並讀掉其餘標頭，返回請求行的各欄位"""
+    request_line = (await reader.readline()).decode("latin-1").split()
+    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+        pass
+    return request_line
+
+
+async def handle_api_request(reader, writer):
+    """處理單一 HTTP 請求（只支援 GET）"""
+    import asyncio
+
+    reasons = {
+        200: "OK", 400: "Bad Request", 404: "Not Found",
+        405: "Method Not Allowed", 500: "Internal Server Error",
+    }
+    try:
+        try:
+            request_line = await asyncio.wait_for(read_request_line(reader), API_READ_TIMEOUT)
+        except asyncio.TimeoutError:
+            return
+        except ValueError:
+            # 請求行或標頭超過 StreamReader 的長度上限
+            request_line = None
+
+        if request_line is None:
+            status, body = encode_api_response(400, {"error": "request too large"})
+        elif len(request_line) < 2:
+            return
+        elif request_line[0] != "GET":
+            status, body = encode_api_response(405, {"error": "method not allowed"})
+        else:
+            try:
+                status, body = get_api_response(request_line[1])
+            except Exception as e:
+                print(f"查詢 API 發生錯誤: {e}")
+                status, body = encode_api_response(500, {"error": f"{type(e).__name__}: {e}"})
+
+        writer.write(
+            f"HTTP/1.1 {status} {reasons[status]}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def run_daemon(interval=CHECK_INTERVAL, host=API_HOST, port=API_PORT, profile=False):
+    """常駐模式：定期檢查更新，並提供查詢 API"""
+    import asyncio
+
+    server = await asyncio.start_server(handle_api_request, host, port)
+    print(f"查詢 API 已啟動：http://{host}:{port}")
+
+    async with server:
+        while True:
+            # 檢查在背景執行緒進行，不影響 API 回應
+            try:
+                await asyncio.to_thread(run_locked_check, profile)
+            except Exception as e:
+                # 單次檢查失敗不應該讓常駐程序與 API 一起結束
+                print(f"檢查時發生錯誤: {e}")
+                import traceback
+                traceback.print_exc()
+                record_run_status("failed", reason=f"{type(e).__name__}: {e}")
+            finally:
+                invalidate_api_cache()
+            await asyncio.sleep(interval)
+
+
+def main():
+    """命令列進入點"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="金寶 Scope3 資料夾更新監控")
+    parser.add_argument("--daemon", action="store_true", help="常駐模式：定期檢查並提供查詢 API")
+    parser.add_argument("--interval", type=int, default=CHECK_INTERVAL, help="常駐模式的檢查間隔（秒）")
+    parser.add_argument("--port", type=int, default=API_PORT, help="查詢 API 埠號")
+    parser.add_argument("--profile", action="store_true", help="產生 cProfile / tracemalloc / Chrome RSS 報告")
+    args = parser.parse_args()
+
+    if args.daemon:
+        import asyncio
+
+        try:
+            asyncio.run(run_daemon(interval=args.interval, port=args.port, profile=args.profile))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    return run_locked_check(profile=args.profile)
 
 
 if __name__ == "__main__":
-    check_for_updates()
+    sys.exit(main())
@@ -0,0 +1,199 @@
+import json
+
+import pytest
+
+import monitor
+
+
+@pytest.fixture
+def state_dir(tmp_path, monkeypatch):
+    """把狀態檔導向暫存目錄，並清空 API 快取"""
+    monkeypatch.setattr(monitor, "SCRIPT_DIR", tmp_path)
+    monkeypatch.setattr(monitor, "FOLDER_DATA_FILE", tmp_path / "folder_data.json")
+    monkeypatch.setattr(monitor, "RUN_STATUS_FILE", tmp_path / "run_status.json")
+    monitor.invalidate_api_cache()
+
+    activities = [
+        {"modifier": "Noah Lin", "action": "新增", "file_name": "a.xlsx", "folder": "CPSG", "time_str": "1 小時前"},
+        {"modifier": "Noah Lin", "action": "編輯", "file_name": "b.xlsx", "folder": "", "time_str": "2 小時前"},
+        {"modifier": "Joy Lu", "action": "編輯", "file_name": "c.xlsx", "folder": "", "time_str": "3 小時前"},
+    ]
+    monitor.save_current_data({"last_check": "2026-01-19T15:26:31", "activities": activities})
+    (tmp_path / "folder_data.json").write_text(json.dumps({
+        "CPSG": {
+            "a.xlsx": {"date": "2026/01/02", "by": "Noah Lin"},
+            "old.xlsx": {"date": "2025/12/30", "by": "Joy Lu"},
+        },
+        "PET 1": {},
+    }), encoding="utf-8")
+
+    yield tmp_path
+    monitor.invalidate_api_cache()
+
+
+def get_json(path):
+    status, body = monitor.get_api_response(path)
+    return status, json.loads(body)
+
+
+def test_recent_activities_limit(state_dir):
+    status, data = get_json("/activities/recent?limit=2")
+    assert status == 200
+    assert data["count"] == 3
+    assert [act["file_name"] for act in data["activities"]] == ["a.xlsx", "b.xlsx"]
+
+
+def test_recent_activities_invalid_limit(state_dir):
+    status, data = get_json("/activities/recent?limit=x")
+    assert status == 400
+    assert "error" in data
+
+
+def test_folder_status(state_dir):
+    status, data = get_json("/folders/CPSG")
+    assert status == 200
+    assert data == {
+        "file_count": 2,
+        "last_updated": "2026/01/02",
+        "last_updated_by": "Noah Lin",
+        "last_updated_file": "a.xlsx",
+        "recent_activity_count": 1,
+    }
+
+    status, data = get_json("/folders/PET%201")
+    assert status == 200
+    assert data["file_count"] == 0
+
+    status, data = get_json("/folders")
+    assert sorted(data["folders"]) == ["CPSG", "PET 1"]
+
+
+def test_unknown_routes(state_dir):
+    assert get_json("/folders/NOPE")[0] == 404
+    assert get_json("/nope")[0] == 404
+
+
+def test_modifier_counts(state_dir):
+    status, data = get_json("/modifiers")
+    assert status == 200
+    assert data["modifiers"] == {
+        "Noah Lin": {"total": 2, "新增": 1, "編輯": 1},
+        "Joy Lu": {"total": 1, "編輯": 1},
+    }
+
+
+def test_cache_key_ignores_unused_query(state_dir):
+    for i in range(50):
+        get_json(f"/folders?x={i}")
+        get_json(f"/activities/recent?limit={1000 + i}")
+    assert set(monitor._api_cache) == {
+        ("folders",),
+        ("activities", "recent", monitor.MAX_RECENT_LIMIT),
+    }
+
+
+def test_errors_are_not_cached(state_dir):
+    get_json("/folders/NOPE")
+    get_json("/activities/recent?limit=x")
+    assert monitor._api_cache == {}
+
+
+def test_cache_cleared_after_run(state_dir):
+    assert get_json("/activities/recent")[1]["count"] == 3
+    assert ("activities", "recent", 20) in monitor._api_cache
+
+    monitor.invalidate_api_cache()
+    assert monitor._api_cache == {}
+
+
+def test_cache_follows_state_file_changes(state_dir):
+    assert get_json("/activities/recent")[1]["count"] == 3
+
+    # 其他程序（例如 cron 執行）改寫狀態檔後不需等到常駐程序下一次檢查
+    monitor.save_current_data({"last_check": None, "activities": []})
+    assert get_json("/activities/recent")[1]["count"] == 0
+
+
+def test_update_folder_data(state_dir):
+    from datetime import datetime
+
+    monitor.update_folder_data([
+        {"modifier": "Joy Lu", "action": "刪除", "file_name": "old.xlsx", "folder": "CPSG", "time": datetime(2026, 1, 20)},
+        {"modifier": "Noah Lin", "action": "新增", "file_name": "new.xlsx", "folder": "HQ", "time": datetime(2026, 1, 19)},
+        {"modifier": "Noah Lin", "action": "編輯", "file_name": "skip.xlsx", "folder": "", "time": datetime(2026, 1, 19)},
+    ])
+
+    status, data = get_json("/folders")
+    assert data["folders"]["CPSG"]["file_count"] == 1
+    assert data["folders"]["HQ"]["last_updated"] == "2026/01/19"
+    assert data["folders"]["HQ"]["last_updated_by"] == "Noah Lin"
+
+
+def test_daemon_survives_failed_run(state_dir, monkeypatch):
+    import asyncio
+
+    calls = []
+
+    def failing_check(profile=False):
+        calls.append(profile)
+        raise OSError("disk full")
+
+    monkeypatch.setattr(monitor, "run_locked_check", failing_check)
+
+    async def run():
+        task = asyncio.create_task(monitor.run_daemon(interval=0, port=0))
+        while len(calls) < 2 and not task.done():
+            await asyncio.sleep(0.01)
+        assert not task.done()
+        task.cancel()
+
+    asyncio.run(run())
+    status = json.loads((state_dir / "run_status.json").read_text(encoding="utf-8"))
+    assert status["status"] == "failed"
+    assert "disk full" in status["reason"]
+
+
+def http_request(raw):
+    """對暫時啟動的 API 伺服器送出原始請求，返回完整回應"""
+    import asyncio
+
+    async def run():
+        server = await asyncio.start_server(monitor.handle_api_request, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            if raw:
+                writer.write(raw)
+                await writer.drain()
+            response = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            return response
+
+    return asyncio.run(run())
+
+
+def test_http_get(state_dir):
+    response = http_request(b"GET /modifiers HTTP/1.1\r\nHost: x\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 200 OK\r\n")
+
+
+def test_http_rejects_other_methods(state_dir):
+    response = http_request(b"POST /modifiers HTTP/1.1\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 405 ")
+
+
+def test_http_internal_error(state_dir):
+    monitor.save_current_data({"last_check": None, "activities": 5})
+    response = http_request(b"GET /modifiers HTTP/1.1\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 500 ")
+    assert b"TypeError" in response
+
+
+def test_http_request_too_large(state_dir):
+    response = http_request(b"GET /" + b"a" * 70000 + b" HTTP/1.1\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 400 ")
+
+
+def test_http_idle_client_is_closed(state_dir, monkeypatch):
+    monkeypatch.setattr(monitor, "API_READ_TIMEOUT", 0.1)
+    assert http_request(b"") == b""
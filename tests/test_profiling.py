@@ -0,0 +1,144 @@
+import json
+import sys
+
+import pytest
+
+import compare_profiles
+import monitor
+
+
+def write_report(report_dir, repo_root, wall_time, cumtime):
+    """建立只含 report.json 與 profile.pstats 的假報告"""
+    import marshal
+
+    report_dir.mkdir(parents=True)
+    report = {
+        "started_at": "2026-01-01T09:00:00",
+        "repo_root": str(repo_root),
+        "wall_time": wall_time,
+        "python_peak_bytes": 1024 * 1024,
+        "chrome_peak_rss_bytes": 200 * 1024 * 1024,
+    }
+    (report_dir / "report.json").write_text(json.dumps(report), encoding="utf-8")
+
+    # pstats 檔案格式：{(檔名, 行號, 函式): (cc, nc, tt, ct, callers)}
+    func = (str(repo_root / "monitor.py"), 42, "get_activity_from_panel")
+    (report_dir / "profile.pstats").write_bytes(marshal.dumps({func: (1, 1, cumtime, cumtime, {})}))
+
+
+def test_percent_change():
+    assert compare_profiles.percent_change(100, 120) == pytest.approx(20)
+    assert compare_profiles.percent_change(100, 80) == pytest.approx(-20)
+    assert compare_profiles.percent_change(0, 10) is None
+
+
+def test_function_key_is_relative_to_repo(tmp_path):
+    func = (str(tmp_path / "monitor.py"), 42, "check_for_updates")
+    assert compare_profiles.function_key(func, tmp_path) == "monitor.py(check_for_updates)"
+    assert compare_profiles.function_key(("/usr/lib/python3.11/json/__init__.py", 1, "dumps"), tmp_path) \
+        == "/usr/lib/python3.11/json/__init__.py:1(dumps)"
+
+
+def test_functions_match_across_checkouts(tmp_path):
+    write_report(tmp_path / "old", tmp_path / "ci" / "repo", 10.0, 4.0)
+    write_report(tmp_path / "new", tmp_path / "local" / "repo", 10.0, 5.0)
+
+    _, old_functions = compare_profiles.load_report(tmp_path / "old")
+    _, new_functions = compare_profiles.load_report(tmp_path / "new")
+    assert old_functions == {"monitor.py(get_activity_from_panel)": 4.0}
+    assert new_functions == {"monitor.py(get_activity_from_panel)": 5.0}
+
+
+def test_compare_reports_threshold(tmp_path):
+    write_report(tmp_path / "old", tmp_path, 10.0, 4.0)
+    write_report(tmp_path / "new", tmp_path, 11.5, 5.0)
+
+    assert compare_profiles.compare_reports(tmp_path / "old", tmp_path / "new", 10, 5) == ["總執行時間"]
+    assert compare_profiles.compare_reports(tmp_path / "old", tmp_path / "new", 20, 5) == []
+
+
+def test_main_exit_code(tmp_path, monkeypatch):
+    write_report(tmp_path / "old", tmp_path, 10.0, 4.0)
+    write_report(tmp_path / "new", tmp_path, 11.5, 5.0)
+
+    monkeypatch.setattr(sys, "argv", ["compare_profiles.py", str(tmp_path / "old"), str(tmp_path / "new")])
+    assert compare_profiles.main() == 1
+
+    monkeypatch.setattr(sys, "argv", ["compare_profiles.py", str(tmp_path / "old"), str(tmp_path / "new"), "--threshold", "50"])
+    assert compare_profiles.main() == 0
+
+
+def test_profiler_writes_report_on_error(tmp_path, monkeypatch):
+    import tracemalloc
+
+    monkeypatch.setattr(monitor, "PROFILE_DIR", tmp_path)
+
+    def broken():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        monitor.run_with_profiler(broken)
+
+    assert not tracemalloc.is_tracing()
+    (report_dir,) = tmp_path.iterdir()
+    report = json.loads((report_dir / "report.json").read_text(encoding="utf-8"))
+    assert report["result"] == "error: RuntimeError: boom"
+    assert (report_dir / "profile.pstats").exists()
+
+
+def scrape_stub():
+    return sum(range(1000))
+
+
+def test_profiler_includes_stage_threads(tmp_path, monkeypatch):
+    monkeypatch.setattr(monitor, "PROFILE_DIR", tmp_path)
+
+    monitor.run_with_profiler(lambda: monitor.run_stage("activity", scrape_stub, timeout=5))
+
+    (report_dir,) = tmp_path.iterdir()
+    _, functions = compare_profiles.load_report(report_dir)
+    assert "tests/test_profiling.py(scrape_stub)" in functions
+
+
+def test_function_key_matches_compare_script(tmp_path):
+    funcs = [
+        (str(tmp_path / "monitor.py"), 42, "check_for_updates"),
+        ("/usr/lib/python3.11/json/__init__.py", 1, "dumps"),
+    ]
+    for func in funcs:
+        assert monitor.function_key(func, tmp_path) == compare_profiles.function_key(func, str(tmp_path))
+
+
+def test_profiler_keeps_func_error_when_report_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr(monitor, "PROFILE_DIR", tmp_path)
+
+    def broken_report(*args):
+        raise OSError("disk full")
+
+    def broken():
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(monitor, "write_profile_report", broken_report)
+    with pytest.raises(RuntimeError):
+        monitor.run_with_profiler(broken)
+
+
+def test_profiler_leaves_existing_tracing_on(tmp_path, monkeypatch):
+    import tracemalloc
+
+    monkeypatch.setattr(monitor, "PROFILE_DIR", tmp_path)
+    tracemalloc.start()
+    try:
+        monitor.run_with_profiler(lambda: True)
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_profiler_runs_do_not_share_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(monitor, "PROFILE_DIR", tmp_path)
+
+    monitor.run_with_profiler(lambda: True)
+    monitor.run_with_profiler(lambda: True)
+
+    assert len(list(tmp_path.iterdir())) == 2
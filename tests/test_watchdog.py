@@ -0,0 +1,93 @@
+import json
+import subprocess
+import time
+
+import pytest
+
+import monitor
+
+
+@pytest.fixture
+def state_dir(tmp_path, monkeypatch):
+    """把鎖定檔與執行結果導向暫存目錄"""
+    monkeypatch.setattr(monitor, "LOCK_FILE", tmp_path / "monitor.lock")
+    monkeypatch.setattr(monitor, "RUN_STATUS_FILE", tmp_path / "run_status.json")
+    return tmp_path
+
+
+def test_run_stage_returns_value():
+    assert monitor.run_stage("login", lambda x: x * 2, 21, timeout=5) == 42
+
+
+def test_run_stage_reraises_errors():
+    def broken():
+        raise ValueError("bad")
+
+    with pytest.raises(ValueError):
+        monitor.run_stage("login", broken, timeout=5)
+
+
+def test_run_stage_timeout_kills_children():
+    child = subprocess.Popen(["sleep", "30"])
+    try:
+        start = time.perf_counter()
+        with pytest.raises(monitor.StageTimeout) as excinfo:
+            monitor.run_stage("login", time.sleep, 3, timeout=0.3)
+        # 不等卡住的呼叫自行返回
+        assert time.perf_counter() - start < 2
+        assert excinfo.value.stage == "login"
+        assert child.wait(timeout=5) is not None
+    finally:
+        if child.poll() is None:
+            child.kill()
+
+
+def test_run_lock_keeps_holder_pid(state_dir):
+    lock_fd = monitor.acquire_run_lock()
+    try:
+        assert monitor.acquire_run_lock() is None
+        assert (state_dir / "monitor.lock").read_text() == str(monitor.os.getpid())
+    finally:
+        monitor.release_run_lock(lock_fd)
+
+    lock_fd = monitor.acquire_run_lock()
+    assert lock_fd is not None
+    monitor.release_run_lock(lock_fd)
+
+
+def test_fetch_activities_restarts_once(monkeypatch):
+    drivers = []
+
+    class FakeDriver:
+        def __init__(self):
+            self.quit_called = False
+
+        def quit(self):
+            self.quit_called = True
+
+    def fake_create_driver():
+        drivers.append(FakeDriver())
+        return drivers[-1]
+
+    monkeypatch.setattr(monitor, "create_driver", fake_create_driver)
+    monkeypatch.setattr(monitor, "login_microsoft", lambda driver: time.sleep(2))
+    monkeypatch.setattr(monitor, "kill_chrome_tree", lambda: None)
+    monkeypatch.setitem(monitor.STAGE_TIMEOUTS, "login", 0.1)
+
+    with pytest.raises(monitor.StageTimeout):
+        monitor.fetch_activities()
+
+    assert len(drivers) == monitor.MAX_DRIVER_RESTARTS + 1
+    assert all(driver.quit_called for driver in drivers)
+
+
+def test_run_locked_check_records_late_failure(state_dir, monkeypatch):
+    def failing_check(profile=False):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(monitor, "check_for_updates", failing_check)
+
+    assert monitor.run_locked_check() == 1
+    status = json.loads((state_dir / "run_status.json").read_text(encoding="utf-8"))
+    assert status["status"] == "failed"
+    assert status["reason"] == "OSError: disk full"